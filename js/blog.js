@@ -1,5 +1,6 @@
 (function () {
     var posts = [];
+    var haystacks = [];
     var postsContainer = document.getElementById('posts');
     var searchInput = document.getElementById('search');
     var status = document.getElementById('results-status');
@@ -8,13 +9,10 @@
         return;
     }
 
+    var HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+
     function escapeHtml(value) {
-        return String(value)
-            .replace(/&/g, '&amp;')
-            .replace(/</g, '&lt;')
-            .replace(/>/g, '&gt;')
-            .replace(/"/g, '&quot;')
-            .replace(/'/g, '&#39;');
+        return String(value).replace(/[&<>"']/g, function (c) { return HTML_ESCAPES[c]; });
     }
 
     function formatDate(value) {
@@ -86,11 +84,8 @@
         }
 
         var normalizedQuery = query.toLowerCase();
-        var filtered = posts.filter(function (post) {
-            var title = String(post.title || '').toLowerCase();
-            var preview = String(post.preview || '').toLowerCase();
-            var tags = Array.isArray(post.tags) ? post.tags.join(' ').toLowerCase() : '';
-            return title.includes(normalizedQuery) || preview.includes(normalizedQuery) || tags.includes(normalizedQuery);
+        var filtered = posts.filter(function (post, i) {
+            return haystacks[i].includes(normalizedQuery);
         });
 
         render(filtered, query);
@@ -106,6 +101,14 @@
         })
         .then(function (data) {
             posts = Array.isArray(data) ? data : [];
+            // One lowercased string per post, built once instead of per keystroke.
+            // Newlines keep a query from matching across field boundaries.
+            haystacks = posts.map(function (post) {
+                var title = String(post.title || '').toLowerCase();
+                var preview = String(post.preview || '').toLowerCase();
+                var tags = Array.isArray(post.tags) ? post.tags.join(' ').toLowerCase() : '';
+                return title + '\n' + preview + '\n' + tags;
+            });
             render(posts, '');
         })
         .catch(function () {
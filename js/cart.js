@@ -210,9 +210,10 @@
         drawer.hidden = true;
     }
 
+    var HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+
     function escapeHtml(s) {
-        return String(s).replace(/&/g, '&amp;').replace(/</g, '&lt;')
-            .replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+        return String(s).replace(/[&<>"]/g, function (c) { return HTML_ESCAPES[c]; });
     }
 
     function renderDrawer() {
@@ -93,9 +93,10 @@
         var tagEls = document.querySelectorAll('.article-tags .tag');
         if (!tagEls.length) return;
 
-        var pageTags = [];
+        // Lookup table so scoring an entry is one pass over its own tags
+        var pageTags = Object.create(null);
         tagEls.forEach(function (el) {
-            pageTags.push(el.textContent.trim().toLowerCase());
+            pageTags[el.textContent.trim().toLowerCase()] = true;
         });
 
         var currentHref = window.location.pathname;
@@ -106,8 +107,15 @@
                 var scored = entries
                     .filter(function (e) { return e.href !== currentHref; })
                     .map(function (e) {
-                        var eTags = (e.tags || []).map(function (t) { return t.toLowerCase(); });
-                        var overlap = pageTags.filter(function (t) { return eTags.indexOf(t) !== -1; }).length;
+                        var counted = Object.create(null);
+                        var overlap = 0;
+                        (e.tags || []).forEach(function (t) {
+                            var key = t.toLowerCase();
+                            if (pageTags[key] && !counted[key]) {
+                                counted[key] = true;
+                                overlap++;
+                            }
+                        });
                         return { entry: e, score: overlap };
                     })
                     .filter(function (s) { return s.score > 0; })
@@ -128,7 +136,7 @@
                     card.href = e.href;
                     card.className = 'route-card';
                     card.innerHTML =
-                        '<i class="bi ' + (e.icon || 'bi-file-earmark') + ' route-icon"></i>' +
+                        '<i class="bi ' + escapeHtml(e.icon || 'bi-file-earmark') + ' route-icon"></i>' +
                         '<h3>' + escapeHtml(e.title) + '</h3>' +
                         '<p>' + escapeHtml((e.preview || '').slice(0, 100)) + '</p>';
                     grid.appendChild(card);
@@ -244,12 +252,10 @@
     /* -------------------------------------------------------
        HELPERS
        ------------------------------------------------------- */
+    var HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+
     function escapeHtml(s) {
-        return String(s)
-            .replace(/&/g, '&amp;')
-            .replace(/</g, '&lt;')
-            .replace(/>/g, '&gt;')
-            .replace(/"/g, '&quot;');
+        return String(s).replace(/[&<>"]/g, function (c) { return HTML_ESCAPES[c]; });
     }
 
     var prefersReducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)').matches;
@@ -9,12 +9,10 @@
     var allItems = [];
     var activeTag = 'all';
 
+    var HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+
     function escapeHtml(s) {
-        return String(s)
-            .replace(/&/g, '&amp;')
-            .replace(/</g, '&lt;')
-            .replace(/>/g, '&gt;')
-            .replace(/"/g, '&quot;');
+        return String(s).replace(/[&<>"]/g, function (c) { return HTML_ESCAPES[c]; });
     }
 
     function buildCard(item) {
@@ -5,12 +5,10 @@
     var statusEl = document.getElementById('track-status');
     if (!container) return;
 
+    var HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+
     function escapeHtml(s) {
-        return String(s)
-            .replace(/&/g, '&amp;')
-            .replace(/</g, '&lt;')
-            .replace(/>/g, '&gt;')
-            .replace(/"/g, '&quot;');
+        return String(s).replace(/[&<>"]/g, function (c) { return HTML_ESCAPES[c]; });
     }
 
     function buildTrack(item) {
@@ -28,14 +28,13 @@
     var statusEl = document.getElementById('search-status');
 
     var entries = [];
+    var searchable = [];
     var loaded = false;
 
+    var HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+
     function escapeHtml(s) {
-        return String(s)
-            .replace(/&/g, '&amp;')
-            .replace(/</g, '&lt;')
-            .replace(/>/g, '&gt;')
-            .replace(/"/g, '&quot;');
+        return String(s).replace(/[&<>"]/g, function (c) { return HTML_ESCAPES[c]; });
     }
 
     function categoryLabel(cat) {
@@ -68,7 +67,7 @@
         }).join(' ');
 
         return [
-            '<a class="search-result-card" href="' + resolveHref(entry.href) + '" role="option">',
+            '<a class="search-result-card" href="' + escapeHtml(resolveHref(entry.href || '')) + '" role="option">',
             '  <div class="search-result-header">',
             '    <i class="bi ' + escapeHtml(entry.icon || 'bi-file-earmark') + ' search-result-icon"></i>',
             '    <span class="search-result-category">' + escapeHtml(categoryLabel(entry.category)) + '</span>',
@@ -96,17 +95,13 @@
             return;
         }
         var q = query.toLowerCase();
-        var scored = entries.map(function (e) {
-            var title = (e.title || '').toLowerCase();
-            var preview = (e.preview || '').toLowerCase();
-            var tags = (e.tags || []).join(' ').toLowerCase();
-            var cat = (e.category || '').toLowerCase();
+        var scored = searchable.map(function (s) {
             var score = 0;
-            if (title.includes(q)) score += 10;
-            if (cat.includes(q)) score += 5;
-            if (tags.includes(q)) score += 3;
-            if (preview.includes(q)) score += 1;
-            return { entry: e, score: score };
+            if (s.title.includes(q)) score += 10;
+            if (s.cat.includes(q)) score += 5;
+            if (s.tags.includes(q)) score += 3;
+            if (s.preview.includes(q)) score += 1;
+            return { entry: s.entry, score: score };
         }).filter(function (s) { return s.score > 0; });
 
         scored.sort(function (a, b) { return b.score - a.score; });
@@ -166,6 +161,16 @@
         })
         .then(function (data) {
             entries = Array.isArray(data) ? data : [];
+            // Lowercase once here rather than on every keystroke
+            searchable = entries.map(function (e) {
+                return {
+                    entry: e,
+                    title: (e.title || '').toLowerCase(),
+                    preview: (e.preview || '').toLowerCase(),
+                    tags: (e.tags || []).join(' ').toLowerCase(),
+                    cat: (e.category || '').toLowerCase()
+                };
+            });
             loaded = true;
             if (!overlay.hidden) render(entries, '');
         })
@@ -173,5 +178,6 @@
             console.warn('Search index load error:', err);
             loaded = true;
             entries = [];
+            searchable = [];
         });
 })();
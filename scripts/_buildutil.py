@@ -0,0 +1,54 @@
+"""Helpers shared by the build scripts in this directory.
+
+The scripts are run as ``python scripts/<name>.py``, which puts this
+directory on sys.path, so they import these directly.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+SEPARATOR_RE = re.compile(r"[-_]+")
+
+
+def title_from_filename(name: str) -> str:
+    stem = Path(name).stem
+    return SEPARATOR_RE.sub(" ", stem).strip().title()
+
+
+def load_state(path: Path) -> dict:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(path: Path, state: dict, indent: int | None = 2) -> None:
+    """Write *state* via a temp file and os.replace so a crash can't truncate it."""
+    separators = (",", ":") if indent is None else None
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(
+        json.dumps(state, indent=indent, separators=separators, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write *text* to *path* unless the file already holds exactly that."""
+    # Encode once and compare raw bytes: a size mismatch skips the read,
+    # and nothing on disk has to be decoded just to be compared.
+    data = text.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    # Write beside the target and rename over it, so the site never
+    # serves (or the next step never reads) a half-written file
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return True
@@ -4,19 +4,42 @@
 Reads .md files with YAML front-matter, converts the body to HTML,
 and writes full site-themed pages into the same directory.
 
-Usage:  python scripts/build-blog.py
+A digest of each post is kept in STATE_PATH, together with a
+fingerprint of the page template and footer year; posts for which both
+are unchanged and whose page still exists are skipped, and the pages of
+posts removed from pages/blog/ are deleted.  Pass --force to rebuild
+everything (e.g. after changing the Markdown converter).
+
+Usage:  python scripts/build-blog.py [--force]
 """
 
 import argparse
+import hashlib
 import re
 import sys
 from datetime import datetime, timezone
 from html import escape as html_escape
 from pathlib import Path
 
+from _buildutil import load_state, save_state, write_if_changed
+
 BLOG_DIR = "pages/blog"
+STATE_PATH = "scripts/build-blog-state.json"
 
 FRONT_MATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+OL_ITEM_RE = re.compile(r"(\d+)\.\s+(.+)$")
+IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+
+# Inline Markdown rules, applied in order: (marker, pattern, replacement).
+# A rule whose marker character is absent from the text cannot match.
+INLINE_RULES = (
+    ("`", re.compile(r"`([^`]+)`"), r"<code>\1</code>"),
+    ("*", re.compile(r"\*\*(.+?)\*\*"), r"<strong>\1</strong>"),
+    ("_", re.compile(r"__(.+?)__"), r"<strong>\1</strong>"),
+    ("*", re.compile(r"\*(.+?)\*"), r"<em>\1</em>"),
+    ("_", re.compile(r"_(.+?)_"), r"<em>\1</em>"),
+    ("[", re.compile(r"\[([^\]]+)\]\(([^)]+)\)"), r'<a href="\2">\1</a>'),
+)
 
 
 def parse_front_matter(text: str) -> tuple[dict, str]:
@@ -80,7 +103,8 @@ def md_to_html(md: str) -> str:
             html_parts.append(f"<li>{inline(stripped[2:])}</li>")
             continue
 
-        ol_match = re.match(r"^(\d+)\.\s+(.+)$", stripped)
+        # Only lines starting with a digit can be list items; skip the regex otherwise
+        ol_match = OL_ITEM_RE.match(stripped) if stripped[0].isdigit() else None
         if ol_match:
             if not in_ol:
                 html_parts.append("<ol>")
@@ -95,16 +119,12 @@ def md_to_html(md: str) -> str:
             html_parts.append("</ol>")
             in_ol = False
 
-        if stripped.startswith("#### "):
-            html_parts.append(f"<h4>{inline(stripped[5:])}</h4>")
-        elif stripped.startswith("### "):
-            html_parts.append(f"<h3>{inline(stripped[4:])}</h3>")
-        elif stripped.startswith("## "):
-            html_parts.append(f"<h2>{inline(stripped[3:])}</h2>")
-        elif stripped.startswith("# "):
-            html_parts.append(f"<h1>{inline(stripped[2:])}</h1>")
+        # Count the leading hashes once rather than testing each heading prefix
+        level = len(stripped) - len(stripped.lstrip("#")) if stripped[0] == "#" else 0
+        if 1 <= level <= 4 and stripped[level:level + 1] == " ":
+            html_parts.append(f"<h{level}>{inline(stripped[level + 1:])}</h{level}>")
         elif stripped.startswith("!["):
-            img_match = re.match(r"!\[([^\]]*)\]\(([^)]+)\)", stripped)
+            img_match = IMAGE_RE.match(stripped)
             if img_match:
                 alt = html_escape(img_match.group(1))
                 src = html_escape(img_match.group(2))
@@ -130,16 +150,9 @@ def md_to_html(md: str) -> str:
 
 def inline(text: str) -> str:
     """Convert inline Markdown (bold, italic, code, links)."""
-    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
-    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
-    text = re.sub(r"__(.+?)__", r"<strong>\1</strong>", text)
-    text = re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
-    text = re.sub(r"_(.+?)_", r"<em>\1</em>", text)
-    text = re.sub(
-        r"\[([^\]]+)\]\(([^)]+)\)",
-        r'<a href="\2">\1</a>',
-        text,
-    )
+    for marker, pattern, repl in INLINE_RULES:
+        if marker in text:
+            text = pattern.sub(repl, text)
     return text
 
 
@@ -153,15 +166,8 @@ def build_tags_html(tags: list[str]) -> str:
     return "\n                        ".join(parts)
 
 
-def generate_blog_page(meta: dict, body_html: str) -> str:
-    title = html_escape(meta.get("title", "Untitled"))
-    description = html_escape(meta.get("description", ""))
-    date = meta.get("date", "")
-    tags = meta.get("tags", [])
-    tags_html = build_tags_html(tags)
-    route = meta.get("route", "blog")
-
-    return f"""<!DOCTYPE html>
+# Filled in with str.format() -- double any literal braces added here.
+PAGE_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -186,7 +192,7 @@ def generate_blog_page(meta: dict, body_html: str) -> str:
     <meta name="twitter:title" content="{title}">
     <meta name="twitter:description" content="{description}">
 </head>
-<body data-route="{html_escape(route)}">
+<body data-route="{route}">
     <a href="#main" class="skip-link">Skip to main content</a>
 
     <nav>
@@ -224,7 +230,7 @@ def generate_blog_page(meta: dict, body_html: str) -> str:
                 <header class="article-header">
                     <h1>{title}</h1>
                     <div class="article-meta">
-                        <span><i class="bi bi-calendar3"></i> {html_escape(date)}</span>
+                        <span><i class="bi bi-calendar3"></i> {date}</span>
                         <span><i class="bi bi-person"></i> Sullivan Steele</span>
                     </div>
                     <div class="article-tags">
@@ -257,7 +263,7 @@ def generate_blog_page(meta: dict, body_html: str) -> str:
 
     <footer>
         <div class="footer-inner">
-            <p>&copy; {datetime.now().year} Sullivan Steele</p>
+            <p>&copy; {year} Sullivan Steele</p>
             <ul class="footer-links">
                 <li><a href="mailto:sullivanrsteele@gmail.com">Email</a></li>
                 <li><a href="https://github.com/IAmADoctorYes" target="_blank" rel="noopener">GitHub</a></li>
@@ -277,13 +283,58 @@ def generate_blog_page(meta: dict, body_html: str) -> str:
 """
 
 
+def template_key(year: int) -> str:
+    """Fingerprint of the page text that doesn't come from the post itself."""
+    data = f"{year}\n{PAGE_TEMPLATE}".encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def generate_blog_page(meta: dict, body_html: str, year: int) -> str:
+    title = html_escape(meta.get("title", "Untitled"))
+    description = html_escape(meta.get("description", ""))
+    date = html_escape(meta.get("date", ""))
+    tags = meta.get("tags", [])
+    tags_html = build_tags_html(tags)
+    route = html_escape(meta.get("route", "blog"))
+
+    return PAGE_TEMPLATE.format(
+        title=title,
+        description=description,
+        date=date,
+        route=route,
+        tags_html=tags_html,
+        body_html=body_html,
+        year=year,
+    )
+
+
+def remove_stale_posts(root: Path, state: dict, md_files: list[Path]) -> bool:
+    """Delete the page of every post whose Markdown source has gone away.
+
+    Only pages recorded in *state* are touched, so hand-written HTML in
+    pages/blog/ is never removed.  Returns True if *state* changed.
+    """
+    stale = state.keys() - {p.name for p in md_files}
+    for name in sorted(stale):
+        page = (root / BLOG_DIR / name).with_suffix(".html")
+        try:
+            page.unlink()
+            print(f"  Removed stale page: {page.relative_to(root)}")
+        except FileNotFoundError:
+            pass
+        del state[name]
+    return bool(stale)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Convert Markdown blog posts to HTML")
     parser.add_argument("--root", default=".", help="Repository root directory")
+    parser.add_argument("--force", action="store_true", help="Rebuild every post, ignoring saved state")
     args = parser.parse_args()
 
     root = Path(args.root).resolve()
     blog_dir = root / BLOG_DIR
+    state_path = root / STATE_PATH
 
     if not blog_dir.is_dir():
         print(f"No blog directory at {blog_dir} â€” nothing to convert.")
@@ -292,30 +343,69 @@ def main():
     md_files = sorted(blog_dir.glob("*.md"))
     md_files = [f for f in md_files if f.name.lower() != "readme.md"]
 
+    state = load_state(state_path)
+    removed = remove_stale_posts(root, state, md_files)
+
     if not md_files:
+        if removed:
+            save_state(state_path, state)
         print("No Markdown posts found in pages/blog/ â€” nothing to convert.")
         return
 
     print(f"Found {len(md_files)} Markdown post(s)")
+    converted = 0
+    unchanged = 0
+    dirty = removed
+    year = datetime.now().year
+    template = template_key(year)
     for md_path in md_files:
-        print(f"  Converting: {md_path.name}")
+        entry = state.get(md_path.name)
+        if isinstance(entry, str):
+            # State from before stamps were recorded held just the digest
+            entry = {"digest": entry}
+        entry = entry or {}
+        st = md_path.stat()
+        stamp = [st.st_size, st.st_mtime_ns]
+        out_path = md_path.with_suffix(".html")
+        # A template edit or a new footer year invalidates every page
+        fresh = not args.force and entry.get("template") == template and out_path.exists()
+        # Cheapest check first: an untouched source needs no read or hash
+        if fresh and entry.get("stamp") == stamp:
+            unchanged += 1
+            continue
+
         raw = md_path.read_text(encoding="utf-8")
+        digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+        record = {"digest": digest, "stamp": stamp, "template": template}
+        if fresh and entry.get("digest") == digest:
+            # Touched but identical: refresh the stamp so next run skips the read
+            state[md_path.name] = record
+            dirty = True
+            unchanged += 1
+            continue
+
+        print(f"  Converting: {md_path.name}")
         meta, body_md = parse_front_matter(raw)
 
         if not meta.get("title"):
             meta["title"] = md_path.stem.replace("-", " ").title()
         if not meta.get("date"):
-            mtime = md_path.stat().st_mtime
-            meta["date"] = datetime.fromtimestamp(mtime, tz=timezone.utc).strftime("%Y-%m-%d")
+            meta["date"] = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).strftime("%Y-%m-%d")
 
         body_html = md_to_html(body_md)
-        page_html = generate_blog_page(meta, body_html)
-
-        out_path = md_path.with_suffix(".html")
-        out_path.write_text(page_html, encoding="utf-8")
-        print(f"  â†’ {out_path.relative_to(root)}")
+        page_html = generate_blog_page(meta, body_html, year)
 
-    print(f"Converted {len(md_files)} post(s).")
+        if write_if_changed(out_path, page_html):
+            print(f"  â†’ {out_path.relative_to(root)}")
+        else:
+            print(f"  â†’ {out_path.relative_to(root)} (unchanged)")
+        state[md_path.name] = record
+        dirty = True
+        converted += 1
+
+    if dirty:
+        save_state(state_path, state)
+    print(f"Converted {converted} post(s), {unchanged} unchanged.")
 
 
 if __name__ == "__main__":
@@ -14,6 +14,8 @@ from datetime import datetime
 from html import escape as html_escape
 from pathlib import Path
 
+from _buildutil import write_if_changed
+
 OUTPUT_PATH = "pages/changelog.html"
 MAX_COMMITS = 60
 
@@ -22,7 +24,10 @@ def get_git_log(root: Path, max_count: int = MAX_COMMITS) -> list[dict]:
     """Retrieve recent commits as structured dicts."""
     try:
         result = subprocess.run(
-            ["git", "log", f"--max-count={max_count}", "--pretty=format:%H|%ai|%s"],
+            [
+                "git", "log", f"--max-count={max_count}",
+                "--abbrev=8", "--date=short", "--pretty=format:%h|%ad|%s",
+            ],
             cwd=str(root),
             capture_output=True,
             text=True,
@@ -53,28 +58,8 @@ def group_by_date(commits: list[dict]) -> dict[str, list[dict]]:
     return groups
 
 
-def generate_page(commits: list[dict]) -> str:
-    grouped = group_by_date(commits)
-    year = datetime.now().year
-
-    entries_html = []
-    for date in sorted(grouped.keys(), reverse=True):
-        items = grouped[date]
-        li_html = "\n".join(
-            f'                        <li><code class="small">{html_escape(c["sha"])}</code> {html_escape(c["message"])}</li>'
-            for c in items
-        )
-        entries_html.append(f"""
-            <div class="changelog-group">
-                <h3 class="changelog-date">{html_escape(date)}</h3>
-                <ul>
-{li_html}
-                </ul>
-            </div>""")
-
-    body = "\n".join(entries_html) if entries_html else '<p class="empty-state">No commits found.</p>'
-
-    return f"""<!DOCTYPE html>
+# Filled in with str.format() -- double any literal braces added here.
+PAGE_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -170,6 +155,36 @@ def generate_page(commits: list[dict]) -> str:
 </html>
 """
 
+GROUP_TEMPLATE = """
+            <div class="changelog-group">
+                <h3 class="changelog-date">{date}</h3>
+                <ul>
+{items}
+                </ul>
+            </div>"""
+
+ITEM_TEMPLATE = '                        <li><code class="small">{sha}</code> {message}</li>'
+
+
+def generate_page(commits: list[dict]) -> str:
+    grouped = group_by_date(commits)
+    year = datetime.now().year
+
+    entries_html = [
+        GROUP_TEMPLATE.format(
+            date=html_escape(date),
+            items="\n".join(
+                ITEM_TEMPLATE.format(sha=html_escape(c["sha"]), message=html_escape(c["message"]))
+                for c in grouped[date]
+            ),
+        )
+        for date in sorted(grouped, reverse=True)
+    ]
+
+    body = "\n".join(entries_html) if entries_html else '<p class="empty-state">No commits found.</p>'
+
+    return PAGE_TEMPLATE.format(body=body, year=year)
+
 
 def main():
     parser = argparse.ArgumentParser(description="Build changelog page from git log")
@@ -186,8 +201,8 @@ def main():
     page_html = generate_page(commits)
     out = root / OUTPUT_PATH
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(page_html, encoding="utf-8")
-    print(f"Generated changelog with {len(commits)} commit(s) â†’ {out}")
+    changed = write_if_changed(out, page_html)
+    print(f"Generated changelog with {len(commits)} commit(s) â†’ {out}" + ("" if changed else " (unchanged)"))
 
 
 if __name__ == "__main__":
@@ -11,6 +11,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from xml.sax.saxutils import escape as xml_escape
 
+from _buildutil import write_if_changed
+
 SITE_URL = "https://www.sullivanrsteele.com"
 FEED_TITLE = "Sullivan Steele"
 FEED_SUBTITLE = "Data scientist, maker, musician — articles, projects, and updates."
@@ -22,10 +24,36 @@ OUTPUT_PATH = "feed.xml"
 INCLUDE_CATEGORIES = {"article", "project-detail", "work", "music", "shop"}
 
 
-def build_atom_feed(entries: list[dict]) -> str:
+# Filled in with str.format() -- double any literal braces added here.
+ENTRY_TEMPLATE = """  <entry>
+    <title>{title}</title>
+    <link href="{url}"/>
+    <id>{url}</id>
+    <updated>{date}</updated>
+    <summary>{preview}</summary>
+{tags_xml}  </entry>"""
+
+FEED_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>{title}</title>
+  <subtitle>{subtitle}</subtitle>
+  <link href="{site_url}/feed.xml" rel="self" type="application/atom+xml"/>
+  <link href="{site_url}/" rel="alternate" type="text/html"/>
+  <id>{site_url}/</id>
+  <updated>{updated}</updated>
+  <author>
+    <name>{author}</name>
+  </author>
+{entries}
+</feed>
+"""
+
+
+def build_atom_feed(entries: list[dict]) -> tuple[str, int]:
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
     items_xml = []
+    latest = ""
     for entry in entries:
         cat = entry.get("category", "")
         if cat not in INCLUDE_CATEGORIES:
@@ -38,36 +66,30 @@ def build_atom_feed(entries: list[dict]) -> str:
         date = entry.get("date", now)
         if not date.endswith("Z") and "+" not in date:
             date = date + "Z" if "T" in date else date + "T00:00:00Z"
+        latest = max(latest, date)
 
-        tags_xml = ""
-        for tag in entry.get("tags", []):
-            tags_xml += f'    <category term="{xml_escape(tag)}"/>\n'
-
-        items_xml.append(
-            f"""  <entry>
-    <title>{title}</title>
-    <link href="{xml_escape(url)}"/>
-    <id>{xml_escape(url)}</id>
-    <updated>{date}</updated>
-    <summary>{preview}</summary>
-{tags_xml}  </entry>"""
+        tags_xml = "".join(
+            f'    <category term="{xml_escape(tag)}"/>\n' for tag in entry.get("tags", [])
         )
 
-    feed = f"""<?xml version="1.0" encoding="UTF-8"?>
-<feed xmlns="http://www.w3.org/2005/Atom">
-  <title>{xml_escape(FEED_TITLE)}</title>
-  <subtitle>{xml_escape(FEED_SUBTITLE)}</subtitle>
-  <link href="{SITE_URL}/feed.xml" rel="self" type="application/atom+xml"/>
-  <link href="{SITE_URL}/" rel="alternate" type="text/html"/>
-  <id>{SITE_URL}/</id>
-  <updated>{now}</updated>
-  <author>
-    <name>{xml_escape(AUTHOR_NAME)}</name>
-  </author>
-{chr(10).join(items_xml)}
-</feed>
-"""
-    return feed
+        items_xml.append(ENTRY_TEMPLATE.format(
+            title=title,
+            url=xml_escape(url),
+            date=date,
+            preview=preview,
+            tags_xml=tags_xml,
+        ))
+
+    feed = FEED_TEMPLATE.format(
+        title=xml_escape(FEED_TITLE),
+        subtitle=xml_escape(FEED_SUBTITLE),
+        site_url=SITE_URL,
+        # The newest entry, not the build time, so an unchanged feed stays byte-identical
+        updated=latest or now,
+        author=xml_escape(AUTHOR_NAME),
+        entries="\n".join(items_xml),
+    )
+    return feed, len(items_xml)
 
 
 def main():
@@ -83,12 +105,11 @@ def main():
         sys.exit(0)
 
     entries = json.loads(index_file.read_text(encoding="utf-8"))
-    feed_xml = build_atom_feed(entries)
+    feed_xml, count = build_atom_feed(entries)
 
     out = root / OUTPUT_PATH
-    out.write_text(feed_xml, encoding="utf-8")
-    count = feed_xml.count("<entry>")
-    print(f"Generated Atom feed with {count} entries → {out}")
+    changed = write_if_changed(out, feed_xml)
+    print(f"Generated Atom feed with {count} entries → {out}" + ("" if changed else " (unchanged)"))
 
 
 if __name__ == "__main__":
@@ -20,27 +20,21 @@ Usage:  python scripts/build-gallery-index.py
 """
 
 import json
-import re
 import sys
 from pathlib import Path
 
+from _buildutil import title_from_filename, write_if_changed
+
 SCAN_DIRS = [Path("assets/gallery"), Path("assets/projects")]
 OUTPUT = Path("assets/gallery.json")
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".svg"}
 
 
-def title_from_filename(name: str) -> str:
-    stem = Path(name).stem
-    return re.sub(r"[-_]+", " ", stem).strip().title()
-
-
 def load_json(path: Path) -> dict | list | None:
-    if path.exists():
-        try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            pass
-    return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return None
 
 
 def scan_dir(scan_dir: Path) -> list[dict]:
@@ -64,8 +58,10 @@ def scan_dir(scan_dir: Path) -> list[dict]:
             if src:
                 covered.add(Path(src).name)
 
-    # Sidecar-based entries
-    for f in sorted(scan_dir.iterdir()):
+    # Sidecar-based entries; one listing answers every "has a sidecar?" check
+    files = sorted(scan_dir.iterdir())
+    names = {f.name for f in files}
+    for f in files:
         if f.suffix.lower() not in IMAGE_EXTS:
             continue
         if f.name.startswith("_") or f.name.startswith("."):
@@ -74,14 +70,15 @@ def scan_dir(scan_dir: Path) -> list[dict]:
             continue
 
         sidecar = f.with_suffix(".json")
-        meta = load_json(sidecar) if sidecar.exists() else {}
+        meta = load_json(sidecar) if sidecar.name in names else {}
         if not isinstance(meta, dict):
             meta = {}
 
+        default_title = title_from_filename(f.name)
         item = {
             "src": "/" + f.as_posix(),
-            "alt": meta.get("alt", title_from_filename(f.name)),
-            "title": meta.get("title", title_from_filename(f.name)),
+            "alt": meta.get("alt", default_title),
+            "title": meta.get("title", default_title),
             "description": meta.get("description", ""),
             "link": meta.get("link", ""),
             "tags": meta.get("tags", []),
@@ -97,8 +94,8 @@ def main():
         all_items.extend(scan_dir(d))
 
     OUTPUT.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT.write_text(json.dumps(all_items, indent=2) + "\n", encoding="utf-8")
-    print(f"gallery.json: {len(all_items)} item(s)")
+    changed = write_if_changed(OUTPUT, json.dumps(all_items, indent=2) + "\n")
+    print(f"gallery.json: {len(all_items)} item(s)" + ("" if changed else " (unchanged)"))
     for item in all_items:
         print(f"  • {item.get('title', '?')}")
 
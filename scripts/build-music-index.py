@@ -21,28 +21,21 @@ Usage:  python scripts/build-music-index.py
 """
 
 import json
-import re
 import sys
 from pathlib import Path
 
+from _buildutil import title_from_filename, write_if_changed
+
 AUDIO_DIR = Path("assets/audio")
 OUTPUT = Path("assets/music.json")
 EXTENSIONS = {".mp3", ".ogg", ".wav", ".flac"}
 
 
-def title_from_filename(name: str) -> str:
-    stem = Path(name).stem
-    return re.sub(r"[-_]+", " ", stem).strip().title()
-
-
 def load_sidecar(audio_path: Path) -> dict:
-    sidecar = audio_path.with_suffix(".json")
-    if sidecar.exists():
-        try:
-            return json.loads(sidecar.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            pass
-    return {}
+    try:
+        return json.loads(audio_path.with_suffix(".json").read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return {}
 
 
 def scan_tracks(audio_dir: Path) -> list[dict]:
@@ -50,11 +43,13 @@ def scan_tracks(audio_dir: Path) -> list[dict]:
         return []
 
     tracks = []
-    for f in sorted(audio_dir.iterdir()):
+    files = sorted(audio_dir.iterdir())
+    names = {f.name for f in files}
+    for f in files:
         if f.suffix.lower() not in EXTENSIONS:
             continue
 
-        meta = load_sidecar(f)
+        meta = load_sidecar(f) if f.stem + ".json" in names else {}
         track = {
             "title": meta.get("title", title_from_filename(f.name)),
             "artist": meta.get("artist", "Sullivan Steele"),
@@ -72,8 +67,8 @@ def scan_tracks(audio_dir: Path) -> list[dict]:
 def main():
     tracks = scan_tracks(AUDIO_DIR)
     OUTPUT.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT.write_text(json.dumps(tracks, indent=2) + "\n", encoding="utf-8")
-    print(f"music.json: {len(tracks)} track(s)")
+    changed = write_if_changed(OUTPUT, json.dumps(tracks, indent=2) + "\n")
+    print(f"music.json: {len(tracks)} track(s)" + ("" if changed else " (unchanged)"))
     for t in tracks:
         print(f"  • {t['title']}")
 
@@ -13,10 +13,23 @@ from datetime import datetime, timezone
 from html.parser import HTMLParser
 from pathlib import Path
 
+from _buildutil import write_if_changed
+
 INDEX_FILE = "assets/search-index.json"
 
-SKIP_DIRS = {".git", ".github", "node_modules", "__pycache__", "scripts", "content"}
+SKIP_DIRS = {
+    ".git", ".github", "node_modules", "__pycache__", "scripts", "content",
+    # Static asset trees never hold indexable pages
+    "assets", "css", "js",
+}
 SKIP_FILES = {"_TEMPLATE.html"}
+# Elements whose text never belongs in a page preview
+SKIP_TEXT_TAGS = frozenset({"nav", "footer", "aside", "script", "style"})
+PREVIEW_LIMIT = 250
+FEED_CHUNK = 4096
+
+TITLE_SUFFIX_RE = re.compile(r"\s*\|\s*Sullivan Steele$")
+WHITESPACE_RE = re.compile(r"\s+")
 
 CATEGORY_RULES = [
     ("pages/blog/", "article", "bi-journal-text"),
@@ -30,6 +43,9 @@ CATEGORY_RULES = [
     ("pages/gallery", "gallery", "bi-images"),
     ("index.html", "home", "bi-house"),
 ]
+# All rule prefixes as one anchored alternation; alternatives are tried in
+# list order, so group N+1 matching means CATEGORY_RULES[N] is the first hit
+CATEGORY_RE = re.compile("|".join(f"({re.escape(prefix)})" for prefix, _, _ in CATEGORY_RULES))
 
 
 class HTMLMetaExtractor(HTMLParser):
@@ -40,38 +56,27 @@ class HTMLMetaExtractor(HTMLParser):
         self.description = ""
         self.keywords = []
         self.body_text_parts = []
+        self._body_len = 0
         self._in_title = False
+        self._head_closed = False
         self._in_body = False
-        self._in_nav = False
-        self._in_footer = False
-        self._in_aside = False
-        self._in_script = False
-        self._in_style = False
-        self._current_tag = None
+        # SKIP_TEXT_TAGS currently open; body text counts only while empty.
+        # A close tag ends only its own kind, so a stray </nav> can't end an <aside>
+        self._skipping = set()
         self._h1 = ""
         self._in_h1 = False
 
     def handle_starttag(self, tag, attrs):
-        attrs_dict = dict(attrs)
-        self._current_tag = tag
-
-        if tag == "title":
+        if tag in SKIP_TEXT_TAGS:
+            self._skipping.add(tag)
+        elif tag == "title":
             self._in_title = True
         elif tag == "h1":
             self._in_h1 = True
         elif tag == "body":
             self._in_body = True
-        elif tag == "nav":
-            self._in_nav = True
-        elif tag == "footer":
-            self._in_footer = True
-        elif tag == "aside":
-            self._in_aside = True
-        elif tag == "script":
-            self._in_script = True
-        elif tag == "style":
-            self._in_style = True
         elif tag == "meta":
+            attrs_dict = dict(attrs)
             name = attrs_dict.get("name", "").lower()
             content = attrs_dict.get("content", "")
             if name == "description":
@@ -80,20 +85,14 @@ class HTMLMetaExtractor(HTMLParser):
                 self.keywords = [k.strip() for k in content.split(",") if k.strip()]
 
     def handle_endtag(self, tag):
-        if tag == "title":
+        if tag in SKIP_TEXT_TAGS:
+            self._skipping.discard(tag)
+        elif tag == "title":
             self._in_title = False
+        elif tag == "head":
+            self._head_closed = True
         elif tag == "h1":
             self._in_h1 = False
-        elif tag == "nav":
-            self._in_nav = False
-        elif tag == "footer":
-            self._in_footer = False
-        elif tag == "aside":
-            self._in_aside = False
-        elif tag == "script":
-            self._in_script = False
-        elif tag == "style":
-            self._in_style = False
 
     def handle_data(self, data):
         if self._in_title:
@@ -102,20 +101,35 @@ class HTMLMetaExtractor(HTMLParser):
             self._h1 += data
         if (
             self._in_body
-            and not self._in_nav
-            and not self._in_footer
-            and not self._in_aside
-            and not self._in_script
-            and not self._in_style
+            and not self._skipping
+            and self._body_len < PREVIEW_LIMIT
+            and not self.description
         ):
             stripped = data.strip()
             if stripped:
                 self.body_text_parts.append(stripped)
+                self._body_len += len(stripped) + 1
+
+    @property
+    def done(self):
+        """True once the head has been read and the preview is complete.
+
+        Reading stops here, so a <title> or <meta> placed inside <body>
+        after this point is deliberately ignored.  Pages without a closing
+        </head> are read to the end.
+        """
+        return (
+            self._head_closed
+            and self._in_body
+            and not self._in_title
+            and bool(self.title.strip())
+            and (bool(self.description) or self._body_len >= PREVIEW_LIMIT)
+        )
 
     @property
     def clean_title(self):
         raw = self.title.strip()
-        return re.sub(r"\s*\|\s*Sullivan Steele$", "", raw).strip() or raw
+        return TITLE_SUFFIX_RE.sub("", raw).strip() or raw
 
     @property
     def heading(self):
@@ -127,41 +141,47 @@ class HTMLMetaExtractor(HTMLParser):
 
 
 def categorize(rel_path: str):
-    normalized = rel_path.replace("\\", "/")
-    for prefix, cat, icon in CATEGORY_RULES:
-        if normalized.startswith(prefix) or normalized == prefix:
-            return cat, icon
+    m = CATEGORY_RE.match(rel_path.replace("\\", "/"))
+    if m:
+        _, cat, icon = CATEGORY_RULES[m.lastindex - 1]
+        return cat, icon
     return "page", "bi-file-earmark"
 
 
-def index_file(filepath: Path, root: Path) -> dict | None:
-    try:
-        raw = filepath.read_text(encoding="utf-8", errors="replace")
-    except OSError:
-        return None
-
+def index_file(filepath: Path, root: Path, date_str: str) -> dict | None:
+    # Stream the page from disk in tag-aligned chunks so text runs aren't
+    # split, and stop reading as soon as the extractor has what it needs.
     parser = HTMLMetaExtractor()
     try:
-        parser.feed(raw)
+        with filepath.open(encoding="utf-8", errors="replace") as f:
+            buf = ""
+            while not parser.done:
+                block = f.read(FEED_CHUNK)
+                if not block:
+                    parser.feed(buf)
+                    break
+                buf += block
+                cut = buf.rfind("<")
+                if cut > 0:
+                    parser.feed(buf[:cut])
+                    buf = buf[cut:]
     except Exception:
+        # Unreadable or unparseable pages are left out of the index
         return None
 
     rel = filepath.relative_to(root).as_posix()
     title = parser.clean_title or parser.heading or rel
     category, icon = categorize(rel)
 
-    preview = parser.description or parser.body_text[:250]
-    preview = re.sub(r"\s+", " ", preview).strip()
-    if len(preview) > 250:
-        preview = preview[:247] + "..."
+    preview = parser.description or parser.body_text[:PREVIEW_LIMIT]
+    preview = WHITESPACE_RE.sub(" ", preview).strip()
+    if len(preview) > PREVIEW_LIMIT:
+        preview = preview[:PREVIEW_LIMIT - 3] + "..."
 
     tags = list(parser.keywords)
     if category not in tags:
         tags.append(category)
 
-    mtime = filepath.stat().st_mtime
-    date_str = datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat()
-
     href = "/" + rel if not rel.startswith("/") else rel
 
     return {
@@ -176,18 +196,56 @@ def index_file(filepath: Path, root: Path) -> dict | None:
     }
 
 
-def build_index(root: Path) -> list[dict]:
+def load_cached_entries(path: Path) -> dict[str, dict]:
+    """Map slug -> entry from a previously written index, if any."""
+    try:
+        entries = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(entries, list):
+        return {}
+    return {e["slug"]: e for e in entries if isinstance(e, dict) and "slug" in e}
+
+
+def iter_pages(directory: str):
+    """Yield a DirEntry for every indexable page below *directory*.
+
+    Walks with os.scandir so file/dir checks come from the cached readdir
+    type instead of extra stat calls; order matches a top-down os.walk.
+    """
+    subdirs = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if name not in SKIP_DIRS:
+                    subdirs.append(entry.path)
+            elif name.endswith(".html") and name not in SKIP_FILES and entry.is_file():
+                yield entry
+    for path in subdirs:
+        yield from iter_pages(path)
+
+
+def build_index(root: Path, cache: dict[str, dict] | None = None) -> list[dict]:
+    """Index every page under *root*.
+
+    An entry in *cache* whose date still equals the file's mtime is reused
+    as-is instead of re-reading and re-parsing the page.
+    """
+    cache = cache or {}
     entries = []
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
-
-        for fname in filenames:
-            if not fname.endswith(".html") or fname in SKIP_FILES:
-                continue
-            filepath = Path(dirpath) / fname
-            entry = index_file(filepath, root)
-            if entry:
-                entries.append(entry)
+    for dir_entry in iter_pages(str(root)):
+        filepath = Path(dir_entry.path)
+        rel = filepath.relative_to(root).as_posix()
+        mtime = dir_entry.stat().st_mtime
+        date_str = datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat()
+        cached = cache.get(rel)
+        if cached and cached.get("date") == date_str:
+            entries.append(cached)
+            continue
+        entry = index_file(filepath, root, date_str)
+        if entry:
+            entries.append(entry)
 
     entries.sort(key=lambda e: e["date"], reverse=True)
     return entries
@@ -197,6 +255,7 @@ def main():
     parser = argparse.ArgumentParser(description="Build site-wide search index")
     parser.add_argument("--root", default=".", help="Repository root directory")
     parser.add_argument("--output", default=INDEX_FILE, help="Output JSON path")
+    parser.add_argument("--force", action="store_true", help="Re-parse every page, ignoring the existing index")
     args = parser.parse_args()
 
     root = Path(args.root).resolve()
@@ -204,15 +263,16 @@ def main():
         print(f"Error: {root} is not a directory", file=sys.stderr)
         sys.exit(1)
 
+    out_path = root / args.output
     print(f"Scanning {root} for HTML files...")
-    entries = build_index(root)
+    entries = build_index(root, None if args.force else load_cached_entries(out_path))
 
-    out_path = root / args.output
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2)
+    # Compact separators keep json.dumps on its C encoder (indent= forces the
+    # pure-Python path) and shrink the file every visitor downloads.
+    changed = write_if_changed(out_path, json.dumps(entries, separators=(",", ":")))
 
-    print(f"Indexed {len(entries)} pages → {out_path}")
+    print(f"Indexed {len(entries)} pages → {out_path}" + ("" if changed else " (unchanged)"))
 
 
     cats = {}
@@ -39,26 +39,22 @@ import re
 import sys
 from pathlib import Path
 
+from _buildutil import title_from_filename, write_if_changed
+
 PRODUCTS_DIR = Path("assets/products")
 OUTPUT = Path("assets/shop.json")
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".svg"}
 
 # Default shipping rates (USD) used when sidecar omits shipping info
 DEFAULT_SHIPPING = {"domestic": 6.50, "international": 18.00}
-
-
-def title_from_filename(name: str) -> str:
-    stem = Path(name).stem
-    return re.sub(r"[-_]+", " ", stem).strip().title()
+PRICE_JUNK_RE = re.compile(r"[^\d.]+")
 
 
 def load_json(path: Path) -> dict | list | None:
-    if path.exists():
-        try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            pass
-    return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return None
 
 
 def normalise_price(raw) -> float:
@@ -66,7 +62,7 @@ def normalise_price(raw) -> float:
     if isinstance(raw, (int, float)):
         return float(raw)
     if isinstance(raw, str):
-        cleaned = re.sub(r"[^\d.]", "", raw)
+        cleaned = PRICE_JUNK_RE.sub("", raw)
         try:
             return float(cleaned)
         except ValueError:
@@ -156,8 +152,10 @@ def scan_products(products_dir: Path) -> list[dict]:
             if img:
                 covered_images.add(Path(img).name)
 
-    # 2. Scan for sidecar-based products
-    for f in sorted(products_dir.iterdir()):
+    # 2. Scan for sidecar-based products; one listing answers every sidecar check
+    files = sorted(products_dir.iterdir())
+    names = {f.name for f in files}
+    for f in files:
         if f.suffix.lower() not in IMAGE_EXTS:
             continue
         if f.name.startswith("_") or f.name.startswith("."):
@@ -166,7 +164,7 @@ def scan_products(products_dir: Path) -> list[dict]:
             continue
 
         sidecar = f.with_suffix(".json")
-        if not sidecar.exists():
+        if sidecar.name not in names:
             continue  # require sidecar for shop items (can't guess price)
 
         meta = load_json(sidecar)
@@ -197,8 +195,8 @@ def scan_products(products_dir: Path) -> list[dict]:
 def main():
     products = scan_products(PRODUCTS_DIR)
     OUTPUT.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT.write_text(json.dumps(products, indent=2) + "\n", encoding="utf-8")
-    print(f"shop.json: {len(products)} product(s)")
+    changed = write_if_changed(OUTPUT, json.dumps(products, indent=2) + "\n")
+    print(f"shop.json: {len(products)} product(s)" + ("" if changed else " (unchanged)"))
     for p in products:
         price = p.get("price", 0)
         stock = p.get("stock", -1)
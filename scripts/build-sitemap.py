@@ -10,6 +10,8 @@ import sys
 from pathlib import Path
 from xml.sax.saxutils import escape as xml_escape
 
+from _buildutil import write_if_changed
+
 SITE_URL = "https://www.sullivanrsteele.com"
 INDEX_PATH = "assets/search-index.json"
 OUTPUT_PATH = "sitemap.xml"
@@ -28,34 +30,36 @@ PRIORITY_MAP = {
 }
 
 
-def build_sitemap(entries: list[dict]) -> str:
-    urls = []
-    for entry in entries:
-        href = entry.get("href", "")
-        loc = SITE_URL + href if href.startswith("/") else href
-        cat = entry.get("category", "page")
-        priority = PRIORITY_MAP.get(cat, "0.5")
-
-        date = entry.get("date", "")
-        lastmod = ""
-        if date:
-            lastmod = date[:10]
-
-        urls.append(
-            f"""  <url>
-    <loc>{xml_escape(loc)}</loc>
-    {f'<lastmod>{lastmod}</lastmod>' if lastmod else ''}
+# Filled in with str.format() -- double any literal braces added here.
+URL_TEMPLATE = """  <url>
+    <loc>{loc}</loc>
+    {lastmod}
     <priority>{priority}</priority>
   </url>"""
-        )
 
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
+SITEMAP_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{chr(10).join(urls)}
+{urls}
 </urlset>
 """
 
 
+def render_url(entry: dict) -> str:
+    href = entry.get("href", "")
+    loc = SITE_URL + href if href.startswith("/") else href
+    cat = entry.get("category", "page")
+    date = entry.get("date", "")
+    return URL_TEMPLATE.format(
+        loc=xml_escape(loc),
+        lastmod=f"<lastmod>{date[:10]}</lastmod>" if date else "",
+        priority=PRIORITY_MAP.get(cat, "0.5"),
+    )
+
+
+def build_sitemap(entries: list[dict]) -> str:
+    return SITEMAP_TEMPLATE.format(urls="\n".join(render_url(e) for e in entries))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Build sitemap.xml")
     parser.add_argument("--root", default=".", help="Repository root directory")
@@ -72,8 +76,8 @@ def main():
     sitemap_xml = build_sitemap(entries)
 
     out = root / OUTPUT_PATH
-    out.write_text(sitemap_xml, encoding="utf-8")
-    print(f"Generated sitemap with {len(entries)} URLs → {out}")
+    changed = write_if_changed(out, sitemap_xml)
+    print(f"Generated sitemap with {len(entries)} URLs → {out}" + ("" if changed else " (unchanged)"))
 
 
 if __name__ == "__main__":
@@ -9,58 +9,129 @@ If a .json sidecar exists next to the PDF it supplies metadata (title,
 description, date, tags, type, route, category).  Otherwise the script
 derives sensible defaults from the filename and PDF contents.
 
+A digest of each PDF and its sidecar is kept in STATE_PATH, together
+with a fingerprint of the page template and footer year; PDFs for which
+both are unchanged and whose page still exists are skipped, and the
+outputs of PDFs removed from content/pdfs/ are deleted.  The files' sizes
+and mtimes are stored alongside, so an untouched PDF isn't even re-read
+to be hashed.  Pass --force to rebuild everything (e.g. after changing
+the text extraction).
+
 Requires: PyMuPDF  (pip install pymupdf)
 
 Usage:
     python scripts/convert-pdfs.py             # from repo root
     python scripts/convert-pdfs.py --root .    # explicit root
+    python scripts/convert-pdfs.py --force     # ignore saved state
+    python scripts/convert-pdfs.py --jobs 4    # worker processes
 """
 
 import argparse
+import hashlib
 import json
 import os
 import re
 import shutil
 import sys
-import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from html import escape as html_escape
 from pathlib import Path
 
 try:
-    import fitz  # PyMuPDF
+    # PyMuPDF >= 1.24.3; the legacy "fitz" name only warns and re-exports it
+    import pymupdf as fitz
 except ImportError:
-    print(
-        "PyMuPDF is required.  Install it with:  pip install pymupdf",
-        file=sys.stderr,
-    )
-    sys.exit(1)
+    try:
+        import fitz  # older PyMuPDF
+    except ImportError:
+        print(
+            "PyMuPDF is required.  Install it with:  pip install pymupdf",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+from _buildutil import load_state, save_state, title_from_filename, write_if_changed
 
 PDF_SOURCE = "content/pdfs"
 PDF_DEST = "assets/pdfs"
 PAGE_DEST = "pages/projects"
+STATE_PATH = "scripts/convert-pdfs-state.json"
 
 BODY_CHAR_LIMIT = 6000
 
+SLUG_UNSAFE_RE = re.compile(r"[^a-z0-9]+")
+# ASCII-only counterpart of SLUG_UNSAFE_RE for str.translate
+SLUG_TABLE = {c: "-" for c in range(128) if not ("a" <= chr(c) <= "z" or "0" <= chr(c) <= "9")}
+WHITESPACE_RE = re.compile(r"\s+")
+
 
 def slug_from_filename(name: str) -> str:
-    stem = Path(name).stem
-    slug = re.sub(r"[^a-z0-9]+", "-", stem.lower()).strip("-")
-    return slug
+    stem = Path(name).stem.lower()
+    if stem.isascii():
+        # Map unsafe characters in one translate pass, then split/join to
+        # collapse runs of dashes and trim them from both ends
+        return "-".join(filter(None, stem.translate(SLUG_TABLE).split("-")))
+    return SLUG_UNSAFE_RE.sub("-", stem).strip("-")
 
 
-def extract_pdf_text(pdf_path: Path) -> str:
-    doc = fitz.open(str(pdf_path))
+def extract_pdf_text(data: bytes, limit: int = BODY_CHAR_LIMIT) -> str:
+    """Return the PDF's text, stopping at the first page that reaches *limit*.
+
+    Only the first *limit* characters are ever rendered, so later pages of
+    long documents are never decoded.
+    """
     parts = []
-    for page in doc:
-        parts.append(page.get_text())
-    doc.close()
+    length = -1  # the join adds len(parts) - 1 separators
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for page in doc:
+            text = page.get_text()
+            parts.append(text)
+            length += len(text) + 1
+            if length >= limit:
+                break
     return "\n".join(parts)
 
 
-def load_sidecar(pdf_path: Path) -> dict:
-    json_path = pdf_path.with_suffix(".json")
-    if json_path.exists():
+def source_digest(pdf_path: Path, sidecar: Path | None) -> str:
+    """Hash a PDF together with its sidecar, if any."""
+    h = hashlib.blake2b(pdf_path.read_bytes(), digest_size=16)
+    if sidecar is not None:
+        h.update(sidecar.read_bytes())
+    return h.hexdigest()
+
+
+def template_key(year: int) -> str:
+    """Fingerprint of the page text that doesn't come from the PDF itself."""
+    data = f"{year}\n{PAGE_TEMPLATE}".encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def source_stamp(pdf_path: Path, sidecar: Path | None) -> list[int]:
+    """Cheap fingerprint of a PDF and its sidecar: sizes and mtimes."""
+    st = pdf_path.stat()
+    stamp = [st.st_size, st.st_mtime_ns]
+    if sidecar is not None:
+        st = sidecar.stat()
+        stamp += [st.st_size, st.st_mtime_ns]
+    return stamp
+
+
+def is_current_copy(dest: Path, src_stat: os.stat_result, data: bytes) -> bool:
+    """True if *dest* already holds *data* (the source PDF's bytes)."""
+    try:
+        st = dest.stat()
+    except FileNotFoundError:
+        return False
+    # Copies keep the source mtime, so an untouched PDF matches on stat alone
+    if (st.st_size, st.st_mtime) == (src_stat.st_size, src_stat.st_mtime):
+        return True
+    return st.st_size == len(data) and dest.read_bytes() == data
+
+
+def load_sidecar(json_path: Path | None) -> dict:
+    if json_path is not None:
         try:
             return json.loads(json_path.read_text(encoding="utf-8"))
         except (json.JSONDecodeError, OSError):
@@ -68,42 +139,31 @@ def load_sidecar(pdf_path: Path) -> dict:
     return {}
 
 
-def title_from_filename(name: str) -> str:
-    stem = Path(name).stem
-    return re.sub(r"[-_]+", " ", stem).strip().title()
-
-
 def make_preview(text: str, limit: int = 200) -> str:
-    clean = re.sub(r"\s+", " ", text).strip()
+    clean = WHITESPACE_RE.sub(" ", text).strip()
     if len(clean) > limit:
         clean = clean[:limit].rsplit(" ", 1)[0] + "..."
     return clean
 
 
 def text_to_html_sections(raw_text: str) -> str:
-    """Turn raw PDF text into simple HTML paragraphs."""
-    text = raw_text[:BODY_CHAR_LIMIT]
-    lines = text.split("\n")
-    paragraphs = []
+    """Turn raw PDF text into simple HTML paragraphs.
+
+    Blank lines separate paragraphs; each one is escaped and emitted as
+    soon as it closes, in a single pass over the lines.
+    """
+    html_parts = []
     buf = []
 
-    for line in lines:
+    for line in raw_text[:BODY_CHAR_LIMIT].split("\n"):
         stripped = line.strip()
-        if not stripped:
-            if buf:
-                paragraphs.append(" ".join(buf))
-                buf = []
-        else:
+        if stripped:
             buf.append(stripped)
+        elif buf:
+            html_parts.append(f"                    <p>{html_escape(' '.join(buf))}</p>")
+            buf = []
     if buf:
-        paragraphs.append(" ".join(buf))
-
-    html_parts = []
-    for para in paragraphs:
-        if not para:
-            continue
-        escaped = html_escape(para)
-        html_parts.append(f"                    <p>{escaped}</p>")
+        html_parts.append(f"                    <p>{html_escape(' '.join(buf))}</p>")
 
     return "\n".join(html_parts)
 
@@ -122,26 +182,14 @@ def build_tags_html(tags: list[str]) -> str:
     return "\n                        ".join(parts)
 
 
-def generate_page(
-    slug: str,
-    title: str,
-    description: str,
-    date_str: str,
-    doc_type: str,
-    route: str,
-    tags: list[str],
-    body_html: str,
-    pdf_download_path: str,
-) -> str:
-    tags_html = build_tags_html(tags)
-    return textwrap.dedent(f"""\
-<!DOCTYPE html>
+# Filled in with str.format() -- double any literal braces added here.
+PAGE_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="description" content="{html_escape(description)}">
-    <title>{html_escape(title)} | Sullivan Steele</title>
+    <meta name="description" content="{description}">
+    <title>{title} | Sullivan Steele</title>
     <link rel="preconnect" href="https://fonts.googleapis.com">
     <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
     <link href="https://fonts.googleapis.com/css2?family=Atkinson+Hyperlegible+Next:ital,wght@0,400;0,700;1,400;1,700&display=swap" rel="stylesheet">
@@ -151,17 +199,17 @@ def generate_page(
     <script defer data-domain="sullivanrsteele.com" src="https://plausible.io/js/script.js"></script>
     <link rel="icon" type="image/png" href="/assets/favicon.png">
     <link rel="apple-touch-icon" href="/assets/apple-touch-icon.png">
-    <meta property="og:title" content="{html_escape(title)} | Sullivan Steele">
-    <meta property="og:description" content="{html_escape(description)}">
+    <meta property="og:title" content="{title} | Sullivan Steele">
+    <meta property="og:description" content="{description}">
     <meta property="og:image" content="https://www.sullivanrsteele.com/assets/portrait.jpg">
     <meta property="og:url" content="https://www.sullivanrsteele.com/pages/projects/{slug}.html">
     <meta property="og:type" content="article">
     <meta name="twitter:card" content="summary">
-    <meta name="twitter:title" content="{html_escape(title)}">
-    <meta name="twitter:description" content="{html_escape(description)}">
+    <meta name="twitter:title" content="{title}">
+    <meta name="twitter:description" content="{description}">
     <meta name="twitter:image" content="https://www.sullivanrsteele.com/assets/portrait.jpg">
 </head>
-<body data-route="{html_escape(route)}">
+<body data-route="{route}">
     <a href="#main" class="skip-link">Skip to main content</a>
 
     <nav>
@@ -192,16 +240,16 @@ def generate_page(
                 <span class="sep">/</span>
                 <a href="../my-work.html" data-nav-route="my-work">My Work</a>
                 <span class="sep">/</span>
-                {html_escape(title)}
+                {title}
             </div>
 
             <article class="article-content">
                 <header class="article-header">
-                    <h1>{html_escape(title)}</h1>
+                    <h1>{title}</h1>
                     <div class="article-meta">
-                        <span><i class="bi bi-calendar3"></i> {html_escape(date_str)}</span>
+                        <span><i class="bi bi-calendar3"></i> {date_str}</span>
                         <span><i class="bi bi-person"></i> Sullivan Steele</span>
-                        <span><i class="bi bi-file-earmark-text"></i> {html_escape(doc_type)}</span>
+                        <span><i class="bi bi-file-earmark-text"></i> {doc_type}</span>
                     </div>
                     <div class="article-tags">
                         {tags_html}
@@ -256,7 +304,7 @@ def generate_page(
 
     <footer>
         <div class="footer-inner">
-            <p>&copy; {datetime.now().year} Sullivan Steele</p>
+            <p>&copy; {year} Sullivan Steele</p>
             <ul class="footer-links">
                 <li><a href="mailto:sullivanrsteele@gmail.com">Email</a></li>
                 <li><a href="https://github.com/IAmADoctorYes" target="_blank" rel="noopener">GitHub</a></li>
@@ -273,22 +321,61 @@ def generate_page(
     <script>if('serviceWorker' in navigator) navigator.serviceWorker.register('/sw.js');</script>
 </body>
 </html>
-""")
+"""
 
 
-def process_pdf(pdf_path: Path, root: Path) -> dict | None:
-    slug = slug_from_filename(pdf_path.name)
-    meta = load_sidecar(pdf_path)
+def generate_page(
+    slug: str,
+    title: str,
+    description: str,
+    date_str: str,
+    doc_type: str,
+    route: str,
+    tags: list[str],
+    body_html: str,
+    pdf_download_path: str,
+    year: int,
+) -> str:
+    title = html_escape(title)
+    description = html_escape(description)
+    tags_html = build_tags_html(tags)
+    return PAGE_TEMPLATE.format(
+        slug=slug,
+        title=title,
+        description=description,
+        date_str=html_escape(date_str),
+        doc_type=html_escape(doc_type),
+        route=html_escape(route),
+        tags_html=tags_html,
+        body_html=body_html,
+        pdf_download_path=pdf_download_path,
+        year=year,
+    )
+
 
-    raw_text = extract_pdf_text(pdf_path)
+def process_pdf(
+    pdf_path: Path, slug: str, root: Path, sidecar: Path | None, year: int
+) -> tuple[list[str], dict | None]:
+    """Convert one PDF; return its log lines and its index entry (or None).
+
+    This runs in pool workers, so nothing is printed here: the parent
+    prints each PDF's lines together, in input order.
+    """
+    log = [f"Processing: {pdf_path.name}"]
+    meta = load_sidecar(sidecar)
+
+    # Read the PDF once; the same bytes feed text extraction and the copy
+    src_stat = pdf_path.stat()
+    data = pdf_path.read_bytes()
+    raw_text = extract_pdf_text(data)
     if not raw_text.strip():
-        print(f"  Skipping {pdf_path.name}: no extractable text")
-        return None
+        log.append(f"  Skipping {pdf_path.name}: no extractable text")
+        return log, None
 
     title = meta.get("title") or title_from_filename(pdf_path.name)
     description = meta.get("description") or make_preview(raw_text)
     date_str = meta.get("date") or datetime.fromtimestamp(
-        pdf_path.stat().st_mtime, tz=timezone.utc
+        src_stat.st_mtime, tz=timezone.utc
     ).strftime("%Y-%m-%d")
     doc_type = meta.get("type", "Document")
     route = meta.get("route", "my-work")
@@ -300,8 +387,12 @@ def process_pdf(pdf_path: Path, root: Path) -> dict | None:
 
     dest_pdf = root / PDF_DEST / f"{slug}.pdf"
     dest_pdf.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(pdf_path, dest_pdf)
-    print(f"  Copied PDF -> {dest_pdf.relative_to(root)}")
+    if is_current_copy(dest_pdf, src_stat, data):
+        log.append(f"  PDF unchanged -> {dest_pdf.relative_to(root)}")
+    else:
+        dest_pdf.write_bytes(data)
+        shutil.copystat(pdf_path, dest_pdf)
+        log.append(f"  Copied PDF -> {dest_pdf.relative_to(root)}")
 
     page_html = generate_page(
         slug=slug,
@@ -313,14 +404,17 @@ def process_pdf(pdf_path: Path, root: Path) -> dict | None:
         tags=tags,
         body_html=body_html,
         pdf_download_path=pdf_download_path,
+        year=year,
     )
 
     dest_html = root / PAGE_DEST / f"{slug}.html"
     dest_html.parent.mkdir(parents=True, exist_ok=True)
-    dest_html.write_text(page_html, encoding="utf-8")
-    print(f"  Generated   -> {dest_html.relative_to(root)}")
+    if write_if_changed(dest_html, page_html):
+        log.append(f"  Generated   -> {dest_html.relative_to(root)}")
+    else:
+        log.append(f"  Unchanged   -> {dest_html.relative_to(root)}")
 
-    return {
+    return log, {
         "slug": slug,
         "title": title,
         "description": description,
@@ -331,32 +425,135 @@ def process_pdf(pdf_path: Path, root: Path) -> dict | None:
     }
 
 
+def remove_stale_outputs(root: Path, state: dict, slugs: dict[str, str]) -> bool:
+    """Delete the page and PDF copy of every source PDF that has gone away.
+
+    *slugs* maps each current PDF filename to its slug.  Only outputs
+    recorded in *state* are touched, so hand-written pages in
+    pages/projects/ are never removed.  Returns True if *state* changed.
+    """
+    stale = state.keys() - slugs.keys()
+    if not stale:
+        return False
+
+    live_slugs = set(slugs.values())
+    for name in sorted(stale):
+        del state[name]
+        slug = slug_from_filename(name)
+        if slug in live_slugs:
+            continue
+        for out in (root / PAGE_DEST / f"{slug}.html", root / PDF_DEST / f"{slug}.pdf"):
+            if out.exists():
+                out.unlink()
+                print(f"  Removed stale -> {out.relative_to(root)}")
+    return True
+
+
 def main():
     parser = argparse.ArgumentParser(description="Convert PDFs to site pages")
     parser.add_argument("--root", default=".", help="Repository root directory")
+    parser.add_argument("--force", action="store_true", help="Rebuild every PDF, ignoring saved state")
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1,
+        help="Number of PDFs to convert in parallel (default: CPU count)",
+    )
     args = parser.parse_args()
 
     root = Path(args.root).resolve()
     src_dir = root / PDF_SOURCE
+    state_path = root / STATE_PATH
+
+    # One listing each for sources and pages answers every existence check below
+    names = set(os.listdir(src_dir)) if src_dir.is_dir() else set()
+    pdfs = [src_dir / name for name in sorted(names) if name.endswith(".pdf")]
+    # Derive every slug once; cleanup, the skip check and conversion share it
+    slugs = {p.name: slug_from_filename(p.name) for p in pdfs}
+
+    state = load_state(state_path)
+    if remove_stale_outputs(root, state, slugs):
+        save_state(state_path, state)
 
     if not src_dir.is_dir():
         print(f"No PDF source directory at {src_dir} â€” nothing to convert.")
         return
-
-    pdfs = sorted(src_dir.glob("*.pdf"))
     if not pdfs:
         print("No PDFs found in content/pdfs/ â€” nothing to convert.")
         return
 
     print(f"Found {len(pdfs)} PDF(s) in {src_dir.relative_to(root)}")
-    converted = []
+    pending = []
+    unchanged = 0
+    dirty = False
+    page_dir = root / PAGE_DEST
+    pages = set(os.listdir(page_dir)) if page_dir.is_dir() else set()
+    year = datetime.now().year
+    template = template_key(year)
     for pdf_path in pdfs:
-        print(f"Processing: {pdf_path.name}")
-        result = process_pdf(pdf_path, root)
-        if result:
-            converted.append(result)
+        sidecar = pdf_path.with_suffix(".json")
+        if sidecar.name not in names:
+            sidecar = None
+        entry = state.get(pdf_path.name)
+        if isinstance(entry, str):
+            # State from before stamps were recorded held just the digest
+            entry = {"digest": entry}
+        entry = entry or {}
+        stamp = source_stamp(pdf_path, sidecar)
+        # Only hash when the stat fingerprint no longer matches
+        if entry.get("stamp") == stamp:
+            digest = entry["digest"]
+        else:
+            digest = source_digest(pdf_path, sidecar)
+        record = {"digest": digest, "stamp": stamp, "template": template}
+        slug = slugs[pdf_path.name]
+        # A template edit or a new footer year invalidates every page
+        if (
+            not args.force
+            and entry.get("digest") == digest
+            and entry.get("template") == template
+            and f"{slug}.html" in pages
+        ):
+            # Touched but identical: refresh the stamp so next run skips the hash
+            if state[pdf_path.name] != record:
+                state[pdf_path.name] = record
+                dirty = True
+            unchanged += 1
+            continue
+        pending.append((pdf_path, slug, sidecar, record))
 
-    print(f"\nConverted {len(converted)} PDF(s) to HTML pages.")
+    # Text extraction is CPU-bound, so convert in separate processes.
+    # Results come back in input order and are recorded in the parent.
+    converted = []
+    jobs = max(1, min(args.jobs, len(pending)))
+    # Hand work out in batches (~4 per worker) so large runs don't pay
+    # one inter-process round trip per PDF.
+    chunksize = max(1, len(pending) // (jobs * 4))
+    columns = (
+        [pdf_path for pdf_path, _, _, _ in pending],
+        [slug for _, slug, _, _ in pending],
+        [root] * len(pending),
+        [sidecar for _, _, sidecar, _ in pending],
+        [year] * len(pending),
+    )
+    # With a single worker (one changed PDF or --jobs 1) a pool would only
+    # add interpreter startup and pickling, so convert in-process instead.
+    with ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext() as pool:
+        if pool:
+            results = pool.map(process_pdf, *columns, chunksize=chunksize)
+        else:
+            results = map(process_pdf, *columns)
+        for (pdf_path, _, _, record), (log, result) in zip(pending, results):
+            print("\n".join(log))
+            if result:
+                converted.append(result)
+                state[pdf_path.name] = record
+                dirty = True
+                # Checkpoint (compactly) so an interrupted run keeps finished PDFs
+                save_state(state_path, state, indent=None)
+
+    # Nothing converted or re-stamped means the file on disk is already current
+    if dirty:
+        save_state(state_path, state)
+    print(f"\nConverted {len(converted)} PDF(s) to HTML pages, {unchanged} unchanged.")
 
 
 if __name__ == "__main__":
@@ -2,12 +2,16 @@
 """
 Fetch daily background images from NASA APOD and Unsplash.
 Saves images and metadata to assets/backgrounds/ directory.
+A source that already has metadata dated today is skipped unless
+--force is given, so repeated pipeline runs don't re-download.
 """
 
+import argparse
 import os
 import json
 import ssl
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Disable SSL verification locally (GitHub Actions doesn't need this)
@@ -23,12 +27,84 @@ PEXELS_API_KEY = '7jiaCZIJLJh1oq1HxZwjBhCE4UCtyE4OIIlE3UfS44Tac3oimxs6XlgQ'
 BACKGROUNDS_DIR = os.path.join('assets', 'backgrounds')
 os.makedirs(BACKGROUNDS_DIR, exist_ok=True)
 
-def fetch_nasa_apod():
+# HD APOD images can run to tens of MB; stream them to disk in 1 MiB pieces
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+def new_session():
+    """Return a pooled session so the API call and image download reuse connections.
+    
+    requests doesn't promise a Session is thread-safe, so each source
+    (fetched on its own thread) gets its own.
+    """
+    session = requests.Session()
+    session.verify = False
+    return session
+
+def load_metadata(meta_path):
+    """Return the metadata saved at meta_path, or {} if there is none"""
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+def fetched_today(meta):
+    """True if the metadata was written earlier today"""
+    return str(meta.get('date', ''))[:10] == datetime.now().date().isoformat()
+
+def download_image(session, img_url, img_path, previous):
+    """Stream img_url to img_path and return (ETag, file size).
+    
+    When the previous run saved the same URL and its ETag, and the file on
+    disk still has the size recorded with them, the request is made
+    conditional; a 304 keeps the existing file and skips the body.
+    """
+    try:
+        on_disk = os.path.getsize(img_path)
+    except OSError:
+        on_disk = None
+    headers = {}
+    if (
+        previous.get('image_url') == img_url
+        and previous.get('etag')
+        and on_disk is not None
+        and previous.get('size') == on_disk
+    ):
+        headers['If-None-Match'] = previous['etag']
+    
+    img_response = session.get(img_url, headers=headers, timeout=60, stream=True)
+    with img_response:
+        if img_response.status_code == 304:
+            return previous['etag'], on_disk
+        img_response.raise_for_status()
+        # Stream into a sibling and swap it in only once the body is complete,
+        # so a dropped connection never leaves a truncated live background
+        tmp_path = img_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in img_response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+            os.replace(tmp_path, img_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return img_response.headers.get('ETag'), os.path.getsize(img_path)
+
+def fetch_nasa_apod(force=False):
     """Fetch NASA Astronomy Picture of the Day"""
+    meta_path = os.path.join(BACKGROUNDS_DIR, 'bg-dark.json')
+    previous = load_metadata(meta_path)
+    if not force and fetched_today(previous):
+        print("  ✓ NASA: already fetched today")
+        return True
+    
     url = f'https://api.nasa.gov/planetary/apod?api_key={NASA_API_KEY}&thumbs=true'
     
+    session = new_session()
     try:
-        response = requests.get(url, timeout=30, verify=False)
+        response = session.get(url, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -43,14 +119,9 @@ def fetch_nasa_apod():
             print("  ✗ NASA: No image available today")
             return False
         
-        # Download image
-        img_response = requests.get(img_url, timeout=60, verify=False)
-        img_response.raise_for_status()
-        
-        # Save image
+        # Download image (conditional on the last ETag for the same URL)
         img_path = os.path.join(BACKGROUNDS_DIR, 'bg-dark.jpg')
-        with open(img_path, 'wb') as f:
-            f.write(img_response.content)
+        etag, size = download_image(session, img_url, img_path, previous)
         
         # Save metadata
         metadata = {
@@ -60,9 +131,13 @@ def fetch_nasa_apod():
             'date': datetime.now().isoformat()
         }
         
-        meta_path = os.path.join(BACKGROUNDS_DIR, 'bg-dark.json')
+        if etag:
+            metadata['image_url'] = img_url
+            metadata['etag'] = etag
+            metadata['size'] = size
+        
         with open(meta_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+            f.write(json.dumps(metadata, indent=2))
         
         print(f"  ✓ NASA: {metadata['title']}")
         return True
@@ -70,14 +145,23 @@ def fetch_nasa_apod():
     except Exception as e:
         print(f"  ✗ NASA fetch error: {e}")
         return False
+    finally:
+        session.close()
 
-def fetch_pexels():
+def fetch_pexels(force=False):
     """Fetch random landscape photo from Pexels"""
+    meta_path = os.path.join(BACKGROUNDS_DIR, 'bg-light.json')
+    previous = load_metadata(meta_path)
+    if not force and fetched_today(previous):
+        print("  ✓ Pexels: already fetched today")
+        return True
+    
     url = 'https://api.pexels.com/v1/search?query=landscape&orientation=landscape&per_page=1&page=1'
     headers = {'Authorization': PEXELS_API_KEY}
     
+    session = new_session()
     try:
-        response = requests.get(url, headers=headers, timeout=30, verify=False)
+        response = session.get(url, headers=headers, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -93,14 +177,9 @@ def fetch_pexels():
             print("  ✗ Pexels: No image URL available")
             return False
         
-        # Download image
-        img_response = requests.get(img_url, timeout=60, verify=False)
-        img_response.raise_for_status()
-        
-        # Save image
+        # Download image (conditional on the last ETag for the same URL)
         img_path = os.path.join(BACKGROUNDS_DIR, 'bg-light.jpg')
-        with open(img_path, 'wb') as f:
-            f.write(img_response.content)
+        etag, size = download_image(session, img_url, img_path, previous)
         
         # Save metadata
         photographer = photo.get('photographer', 'Unknown')
@@ -114,9 +193,13 @@ def fetch_pexels():
             'date': datetime.now().isoformat()
         }
         
-        meta_path = os.path.join(BACKGROUNDS_DIR, 'bg-light.json')
+        if etag:
+            metadata['image_url'] = img_url
+            metadata['etag'] = etag
+            metadata['size'] = size
+        
         with open(meta_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+            f.write(json.dumps(metadata, indent=2))
         
         print(f"  ✓ Pexels: {title} by {photographer}")
         return True
@@ -124,12 +207,22 @@ def fetch_pexels():
     except Exception as e:
         print(f"  ✗ Pexels fetch error: {e}")
         return False
+    finally:
+        session.close()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Fetch daily background images")
+    parser.add_argument('--force', action='store_true', help="Re-fetch even if today's images exist")
+    args = parser.parse_args()
+    
     print("Fetching background images...")
     
-    nasa_ok = fetch_nasa_apod()
-    pexels_ok = fetch_pexels()
+    # The two sources are independent, so fetch them side by side
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        nasa = pool.submit(fetch_nasa_apod, args.force)
+        pexels = pool.submit(fetch_pexels, args.force)
+        nasa_ok = nasa.result()
+        pexels_ok = pexels.result()
     
     if nasa_ok and pexels_ok:
         print("\nBackground fetch complete!")
@@ -2,13 +2,21 @@
 """Optimize images in asset directories.
 
 Resizes large images and compresses JPEGs/PNGs for faster page loads.
+A content hash of every optimized image is kept in STATE_PATH so files
+that have not changed since the last run are not re-encoded.  The files'
+sizes and mtimes are stored alongside, so an untouched image isn't even
+re-read to be hashed.
 Requires Pillow: pip install pillow
 
-Usage:  python scripts/optimize-images.py
+Usage:  python scripts/optimize-images.py [--jobs N]
 """
 
 import argparse
+import hashlib
+import io
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -18,82 +26,159 @@ except ImportError:
     print("Install with: pip install pillow")
     sys.exit(0)
 
+from _buildutil import load_state, save_state
+
 SCAN_DIRS = ["assets/gallery", "assets/products", "assets/projects"]
 MAX_WIDTH = 1600
 MAX_HEIGHT = 1200
 JPEG_QUALITY = 82
 PNG_OPTIMIZE = True
 
-EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+# Suffix -> (Pillow format, save options); also the set of files we touch
+SAVE_OPTIONS = {
+    ".jpg": ("JPEG", {"quality": JPEG_QUALITY, "optimize": True}),
+    ".jpeg": ("JPEG", {"quality": JPEG_QUALITY, "optimize": True}),
+    ".png": ("PNG", {"optimize": PNG_OPTIMIZE}),
+    ".webp": ("WEBP", {"quality": JPEG_QUALITY}),
+}
+EXTENSIONS = frozenset(SAVE_OPTIONS)
+
+STATE_PATH = "scripts/optimize-images-state.json"
+# Save state after this many processed images so an interrupted run keeps them
+CHECKPOINT_EVERY = 10
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def file_stamp(path: Path) -> list[int]:
+    """Cheap fingerprint of a file: its size and mtime."""
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def file_record(path: Path) -> dict:
+    return {"digest": file_digest(path), "stamp": file_stamp(path)}
+
+
+def find_images(directory: Path):
+    """Yield image files under *directory*, matching on the raw filename."""
+    for dirpath, _dirnames, filenames in os.walk(directory):
+        for fname in filenames:
+            if os.path.splitext(fname)[1].lower() in EXTENSIONS:
+                yield Path(dirpath, fname)
 
 
 def optimize_image(path: Path) -> bool:
-    """Resize and compress a single image. Returns True if modified."""
+    """Resize and compress a single image. Returns True if the file was rewritten.
+
+    The image is encoded in memory first and only written back when it
+    was resized or the re-encode is actually smaller than the original.
+    """
     try:
         img = Image.open(path)
     except Exception as e:
         print(f"  Could not open {path.name}: {e}")
         return False
 
-    original_size = path.stat().st_size
-    modified = False
-
-    if img.width > MAX_WIDTH or img.height > MAX_HEIGHT:
-        img.thumbnail((MAX_WIDTH, MAX_HEIGHT), Image.LANCZOS)
-        modified = True
+    with img:
+        original_size = path.stat().st_size
+        resized = False
 
-    suffix = path.suffix.lower()
-    save_kwargs = {}
+        if img.width > MAX_WIDTH or img.height > MAX_HEIGHT:
+            img.thumbnail((MAX_WIDTH, MAX_HEIGHT), Image.LANCZOS)
+            resized = True
 
-    if suffix in (".jpg", ".jpeg"):
-        save_kwargs["quality"] = JPEG_QUALITY
-        save_kwargs["optimize"] = True
-        if img.mode in ("RGBA", "P"):
+        fmt, save_kwargs = SAVE_OPTIONS[path.suffix.lower()]
+        if fmt == "JPEG" and img.mode in ("RGBA", "P"):
             img = img.convert("RGB")
-        modified = True
-    elif suffix == ".png":
-        save_kwargs["optimize"] = PNG_OPTIMIZE
-        modified = True
-    elif suffix == ".webp":
-        save_kwargs["quality"] = JPEG_QUALITY
-        modified = True
-
-    if modified:
-        img.save(path, **save_kwargs)
-        new_size = path.stat().st_size
-        saved = original_size - new_size
-        if saved > 0:
-            print(f"  {path.name}: {original_size:,}B → {new_size:,}B (saved {saved:,}B)")
-        else:
-            print(f"  {path.name}: already optimal")
-        return True
-
-    return False
+
+        buf = io.BytesIO()
+        img.save(buf, format=fmt, **save_kwargs)
+
+    new_size = buf.tell()
+    if not resized and new_size >= original_size:
+        print(f"  {path.name}: already optimal")
+        return False
+
+    # These are the source assets, so never leave a half-written one behind
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(buf.getbuffer())
+    os.replace(tmp, path)
+    saved = original_size - new_size
+    if saved > 0:
+        print(f"  {path.name}: {original_size:,}B → {new_size:,}B (saved {saved:,}B)")
+    else:
+        print(f"  {path.name}: resized ({new_size:,}B)")
+    return True
 
 
 def main():
     parser = argparse.ArgumentParser(description="Optimize images for the web")
     parser.add_argument("--root", default=".", help="Repository root directory")
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1,
+        help="Number of images to optimize in parallel (default: CPU count)",
+    )
     args = parser.parse_args()
 
     root = Path(args.root).resolve()
+    state_path = root / STATE_PATH
+    state = load_state(state_path)
     total = 0
-
-    for scan_dir in SCAN_DIRS:
-        d = root / scan_dir
-        if not d.is_dir():
-            continue
-
-        images = [f for f in d.rglob("*") if f.suffix.lower() in EXTENSIONS]
-        if not images:
-            continue
-
-        print(f"Optimizing {len(images)} image(s) in {scan_dir}/")
-        for img_path in images:
-            if optimize_image(img_path):
+    unchanged = 0
+    dirty = False
+
+    # Pillow releases the GIL while decoding and encoding, so threads are
+    # enough to keep every core busy without pickling images to processes.
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        # Submit each changed image as soon as it is found: hashing the rest
+        # overlaps with encoding, and no directory waits on the previous one.
+        submitted = []
+        for scan_dir in SCAN_DIRS:
+            d = root / scan_dir
+            if not d.is_dir():
+                continue
+
+            queued = 0
+            for img_path in find_images(d):
+                key = img_path.relative_to(root).as_posix()
+                entry = state.get(key)
+                if isinstance(entry, str):
+                    # State from before stamps were recorded held just the digest
+                    entry = {"digest": entry}
+                entry = entry or {}
+                stamp = file_stamp(img_path)
+                # Only hash when the stat fingerprint no longer matches
+                if entry.get("stamp") == stamp:
+                    unchanged += 1
+                    continue
+                digest = file_digest(img_path)
+                if entry.get("digest") == digest:
+                    # Touched but identical: refresh the stamp so next run skips the hash
+                    state[key] = {"digest": digest, "stamp": stamp}
+                    dirty = True
+                    unchanged += 1
+                    continue
+                submitted.append((key, img_path, pool.submit(optimize_image, img_path)))
+                queued += 1
+            if queued:
+                print(f"Optimizing {queued} image(s) in {scan_dir}/")
+
+        for done, (key, img_path, future) in enumerate(submitted, 1):
+            if future.result():
                 total += 1
-
-    print(f"\nOptimized {total} image(s) total.")
+            # Record the result either way so an already-optimal file is not retried
+            state[key] = file_record(img_path)
+            dirty = True
+            if done % CHECKPOINT_EVERY == 0:
+                save_state(state_path, state)
+
+    # A run where every image was unchanged leaves the state file untouched
+    if dirty:
+        save_state(state_path, state)
+    print(f"\nOptimized {total} image(s) total, {unchanged} unchanged since last run.")
 
 
 if __name__ == "__main__":
@@ -8,27 +8,44 @@ site's local content pipeline only.
 Usage:
     python scripts/sync-google-docs.py
     python scripts/sync-google-docs.py --root . --skip-backgrounds
+    python scripts/sync-google-docs.py --jobs 1    # one script at a time
 """
 
 from __future__ import annotations
 
 import argparse
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+# Scripts within a stage don't read each other's output, so they may run
+# concurrently; each stage starts only after the previous one finished.
+# convert-pdfs and optimize-images each size their own worker pool to the
+# CPU count, so they go in separate stages rather than side by side.
 PIPELINE = [
-    "scripts/convert-pdfs.py",
-    "scripts/build-blog.py",
-    "scripts/optimize-images.py",
-    "scripts/build-music-index.py",
-    "scripts/build-shop-index.py",
-    "scripts/build-gallery-index.py",
-    "scripts/build-search-index.py",
-    "scripts/build-feed.py",
-    "scripts/build-sitemap.py",
-    "scripts/build-changelog.py",
+    # Sources -> pages
+    [
+        "scripts/convert-pdfs.py",
+        "scripts/build-blog.py",
+    ],
+    # Images and asset indexes
+    [
+        "scripts/optimize-images.py",
+        "scripts/build-music-index.py",
+        "scripts/build-shop-index.py",
+        "scripts/build-gallery-index.py",
+    ],
+    # Indexes every page written above
+    ["scripts/build-search-index.py"],
+    # Read the search index or git history
+    [
+        "scripts/build-feed.py",
+        "scripts/build-sitemap.py",
+        "scripts/build-changelog.py",
+    ],
 ]
 
 OPTIONAL_PIPELINE = [
@@ -36,18 +53,52 @@ OPTIONAL_PIPELINE = [
 ]
 
 
-def run_script(repo_root: Path, script_rel: str) -> None:
+def run_script(repo_root: Path, script_rel: str, buffered: bool = False) -> None:
     script_path = repo_root / script_rel
     if not script_path.exists():
         print(f"Skipping missing script: {script_rel}")
         return
 
-    print(f"Running: {script_rel}")
-    subprocess.run(
+    if not buffered:
+        print(f"Running: {script_rel}")
+        subprocess.run(
+            [sys.executable, str(script_path)],
+            cwd=str(repo_root),
+            check=True,
+        )
+        return
+
+    # Concurrent scripts would interleave their logs, so collect each
+    # one's output and print it as a single block when it finishes.
+    # The child encodes for our stdout, so its bytes are passed through
+    # as-is instead of being decoded here only to be re-encoded.
+    encoding = sys.stdout.encoding or "utf-8"
+    result = subprocess.run(
         [sys.executable, str(script_path)],
         cwd=str(repo_root),
-        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env={**os.environ, "PYTHONIOENCODING": f"{encoding}:replace"},
     )
+    header = f"Running: {script_rel}\n".encode(encoding, "replace")
+    sys.stdout.flush()
+    sys.stdout.buffer.write(header + result.stdout)
+    sys.stdout.buffer.flush()
+    if result.returncode:
+        raise subprocess.CalledProcessError(result.returncode, result.args)
+
+
+def run_stage(repo_root: Path, scripts: list[str], jobs: int) -> None:
+    if jobs <= 1 or len(scripts) == 1:
+        for script_rel in scripts:
+            run_script(repo_root, script_rel)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(jobs, len(scripts))) as pool:
+        futures = [pool.submit(run_script, repo_root, s, True) for s in scripts]
+        # Wait for all of them; the first failure (in pipeline order) is raised
+        for future in futures:
+            future.result()
 
 
 def main() -> int:
@@ -60,12 +111,16 @@ def main() -> int:
         action="store_true",
         help="Skip optional background image fetch script",
     )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1,
+        help="Number of independent scripts to run at once (default: CPU count)",
+    )
     args = parser.parse_args()
 
     repo_root = Path(args.root).resolve()
 
-    for required in PIPELINE:
-        run_script(repo_root, required)
+    for stage in PIPELINE:
+        run_stage(repo_root, stage, args.jobs)
 
     if not args.skip_backgrounds:
         for optional in OPTIONAL_PIPELINE: